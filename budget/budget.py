@@ -1,16 +1,117 @@
 """Simple personal budget tracker."""
 
 import os
+import sqlite3
+import sys
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
-
-from sqlalchemy import create_engine, desc
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import (
+    case,
+    column,
+    create_engine,
+    delete,
+    desc,
+    event,
+    func,
+    insert,
+    lambda_stmt,
+    literal,
+    select,
+    table,
+    text,
+    update,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Row
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import sessionmaker
-
-from budget.models import Balance, Card, Category, SpendingLimit, Transaction
+from sqlalchemy.orm.attributes import set_committed_value
+
+from budget.models import (
+    DAILY_TOTAL_TRIGGERS,
+    REPORT_CACHE_TRIGGERS,
+    TRANSACTION_FTS_TABLE,
+    TRANSACTION_FTS_TRIGGERS,
+    Balance,
+    Base,
+    Card,
+    Category,
+    DailyTotal,
+    MonthlyReportCache,
+    SpendingLimit,
+    Transaction,
+)
 from budget.utils import generate_transaction_hash, serialize_import_metadata
 
+# Prepared statements kept per SQLite connection (the sqlite3 default is 128)
+SQLITE_STATEMENT_CACHE_SIZE = 256
+# Bytes of the database file to memory-map (256 MiB); a non-empty
+# BUDGET_MMAP_SIZE overrides it, and 0 turns memory-mapped reads off
+SQLITE_MMAP_SIZE = int(os.environ.get("BUDGET_MMAP_SIZE") or "268435456")
+# Page cache per connection; negative values are KiB (64 MiB)
+SQLITE_CACHE_SIZE = -64 * 1024
+
+# Stored in PRAGMA user_version once the schema below is in place; bump it
+# whenever tables, indexes or triggers change so existing databases upgrade
+SCHEMA_VERSION = 1
+
+# Report expressions shared by the cached (lambda) statements below.
+# Empty and NULL categories both report as "Uncategorized".
+_CATEGORY_KEY = func.coalesce(
+    func.nullif(Transaction.category, ""), "Uncategorized"
+)
+_CATEGORY_TOTAL = func.sum(Transaction.amount).label("total")
+
+# Trigram full-text search needs at least three characters to use the index
+FTS_MIN_QUERY_LENGTH = 3
+# Longer search text is rejected before it reaches the database
+MAX_QUERY_LENGTH = 128
+# Rows checked for duplicates and inserted per statement during imports
+IMPORT_BATCH_SIZE = 500
+# Upper bound on rows a single search returns, so an unfiltered search
+# cannot materialise the whole table
+MAX_SEARCH_RESULTS = 10_000
+_FTS = table("transactions_fts", column("rowid"), column("transactions_fts"))
+
+
+def _parse_date(value: str) -> datetime:
+    """Parse an ISO date or timestamp search filter.
+
+    Raises:
+        ValueError: If the value is not in ISO format
+    """
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Invalid date '{value}', expected YYYY-MM-DD") from None
+
+
+def _fts5_available(conn) -> bool:
+    """Check whether SQLite provides FTS5 with the trigram tokenizer (3.34+)."""
+    if sqlite3.sqlite_version_info < (3, 34, 0):
+        return False
+    options = conn.exec_driver_sql("PRAGMA compile_options").scalars()
+    return "ENABLE_FTS5" in set(options)
+
+
+def _configure_sqlite(dbapi_connection, connection_record):
+    """Tune each new SQLite connection in the pool.
+
+    WAL lets readers proceed while a write is in progress, and
+    synchronous=NORMAL is durable under WAL while skipping most fsyncs.
+    Temporary sort/group tables stay in memory instead of temp files, and
+    reads go through a memory map and a larger page cache.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cursor.execute(f"PRAGMA cache_size={SQLITE_CACHE_SIZE}")
+    cursor.close()
+
 
 class Budget:
     """Simple budget tracker for managing transactions, balances, and spending limits."""
@@ -22,17 +123,108 @@ class Budget:
             db_name: Name of the SQLite database file
         """
         self.db_name = os.environ.get("BUDGET_DB_NAME", db_name)
-        self.engine = create_engine(f"sqlite:///{self.db_name}")
-        self.Session = sessionmaker(bind=self.engine)
+        # One engine per tracker; sessions check connections out of its pool.
+        # A larger per-connection statement cache keeps every query the
+        # tracker issues prepared instead of re-parsing its SQL.
+        self.engine = create_engine(
+            f"sqlite:///{self.db_name}",
+            connect_args={"cached_statements": SQLITE_STATEMENT_CACHE_SIZE},
+        )
+        event.listen(self.engine, "connect", _configure_sqlite)
+        # Committed objects keep their loaded state, so returning IDs after
+        # commit does not cost a refresh SELECT
+        self.Session = sessionmaker(bind=self.engine, expire_on_commit=False)
         self._init_db()
 
+    def close(self):
+        """Close all pooled database connections."""
+        self.engine.dispose()
+
     def _init_db(self):
-        """Initialize database tables."""
-        from budget.models import Base
+        """Initialize database tables.
+
+        Databases already stamped with SCHEMA_VERSION skip the DDL below.
+        """
+        with self.engine.begin() as conn:
+            # Full-text search needs FTS5 with the trigram tokenizer; without
+            # it, text searches fall back to LIKE scans
+            self.fts_enabled = _fts5_available(conn)
+            has_fts = conn.execute(
+                text(
+                    "SELECT 1 FROM sqlite_master "
+                    "WHERE type = 'table' AND name = 'transactions_fts'"
+                )
+            ).first()
+            version = conn.exec_driver_sql("PRAGMA user_version").scalar()
+            if version == SCHEMA_VERSION and (has_fts or not self.fts_enabled):
+                return
+
+            Base.metadata.create_all(conn)
+            # create_all skips indexes on tables that already exist
+            for index in Transaction.__table__.indexes:
+                index.create(conn, checkfirst=True)
+
+            has_triggers = conn.execute(
+                text(
+                    "SELECT 1 FROM sqlite_master "
+                    "WHERE type = 'trigger' AND name = 'daily_totals_after_insert'"
+                )
+            ).first()
+            if not has_triggers:
+                # Backfill totals for databases created before the triggers existed
+                conn.execute(text("DELETE FROM daily_totals"))
+                conn.execute(
+                    text(
+                        "INSERT INTO daily_totals (day, total, txn_count) "
+                        "SELECT date(timestamp), SUM(amount), COUNT(*) "
+                        "FROM transactions WHERE timestamp IS NOT NULL "
+                        "GROUP BY date(timestamp)"
+                    )
+                )
 
-        Base.metadata.create_all(self.engine)
+            if self.fts_enabled and not has_fts:
+                conn.execute(text(TRANSACTION_FTS_TABLE))
+                # Index rows written before full-text search existed
+                conn.execute(
+                    text(
+                        "INSERT INTO transactions_fts (transactions_fts) "
+                        "VALUES ('rebuild')"
+                    )
+                )
+
+            triggers = DAILY_TOTAL_TRIGGERS + REPORT_CACHE_TRIGGERS
+            if self.fts_enabled:
+                triggers = triggers + TRANSACTION_FTS_TRIGGERS
+            for ddl in triggers:
+                conn.execute(text(ddl))
+
+            conn.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
 
     # Transaction operations
+    @staticmethod
+    def validate_transaction(type: str, description: str, amount: float) -> str:
+        """Check the fields every new transaction must satisfy.
+
+        Args:
+            type: "cash" or "card"
+            description: Transaction description
+            amount: Amount (must be positive)
+
+        Returns:
+            The description with surrounding whitespace stripped
+
+        Raises:
+            ValueError: If validation fails
+        """
+        description = description.strip()
+        if not description:
+            raise ValueError("Description cannot be empty")
+        if amount <= 0:
+            raise ValueError("Amount must be positive")
+        if type not in ["cash", "card"]:
+            raise ValueError("Type must be 'cash' or 'card'")
+        return description
+
     def add_transaction(
         self,
         type: str,
@@ -56,19 +248,14 @@ class Budget:
         Raises:
             ValueError: If validation fails
         """
-        if not description.strip():
-            raise ValueError("Description cannot be empty")
-        if amount <= 0:
-            raise ValueError("Amount must be positive")
-        if type not in ["cash", "card"]:
-            raise ValueError("Type must be 'cash' or 'card'")
+        description = self.validate_transaction(type, description, amount)
 
         with self.Session() as session:
             txn = Transaction(
                 type=type,
                 card=card,
                 category=category,
-                description=description.strip(),
+                description=description,
                 amount=float(amount),
                 import_source="manual",
             )
@@ -76,6 +263,49 @@ class Budget:
             session.commit()
             return txn.id
 
+    def add_transactions(self, transactions: List[dict]) -> List[int]:
+        """Add several transactions in a single database transaction.
+
+        Args:
+            transactions: List of transaction dicts with keys:
+                - type: str
+                - description: str
+                - amount: float
+                - card: str (optional)
+                - category: str (optional)
+
+        Returns:
+            IDs of the new transactions, in input order
+
+        Raises:
+            ValueError: If any transaction fails validation (nothing is added)
+        """
+        rows = [
+            {
+                "type": txn_data["type"],
+                "card": txn_data.get("card"),
+                "category": txn_data.get("category"),
+                "description": self.validate_transaction(
+                    txn_data["type"], txn_data["description"], txn_data["amount"]
+                ),
+                "amount": float(txn_data["amount"]),
+                "import_source": "manual",
+            }
+            for txn_data in transactions
+        ]
+        if not rows:
+            return []
+
+        # Bulk INSERT ... RETURNING from plain dicts, skipping per-object
+        # unit-of-work bookkeeping; IDs come back in input order
+        stmt = insert(Transaction).returning(
+            Transaction.id, sort_by_parameter_order=True
+        )
+        with self.Session() as session:
+            ids = list(session.scalars(stmt, rows))
+            session.commit()
+            return ids
+
     def add_transaction_safe(
         self,
         type: str,
@@ -102,12 +332,7 @@ class Budget:
         Returns:
             Tuple of (transaction_id, is_new) where is_new indicates if it was added
         """
-        if not description.strip():
-            raise ValueError("Description cannot be empty")
-        if amount <= 0:
-            raise ValueError("Amount must be positive")
-        if type not in ["cash", "card"]:
-            raise ValueError("Type must be 'cash' or 'card'")
+        description = self.validate_transaction(type, description, amount)
 
         if date is None:
             date = datetime.now()
@@ -126,7 +351,7 @@ class Budget:
                 type=type,
                 card=card,
                 category=category,
-                description=description.strip(),
+                description=description,
                 amount=float(amount),
                 timestamp=date,
                 hash=txn_hash,
@@ -177,28 +402,75 @@ class Budget:
             "errors": 0,
         }
 
+        rows = []
+        seen = set()
+        errors = []
         for txn_data in transactions:
             try:
-                _, is_new = self.add_transaction_safe(
-                    type=txn_data.get("type", "card"),
-                    description=txn_data["description"],
-                    amount=txn_data["amount"],
-                    date=txn_data.get("date"),
-                    card=txn_data.get("card"),
-                    category=txn_data.get("category"),
-                    import_source=import_source,
-                    import_metadata=txn_data.get("metadata"),
-                )
-
-                if is_new:
-                    stats["imported"] += 1
-                else:
-                    stats["duplicates"] += 1
-
+                type = txn_data.get("type", "card")
+                description = txn_data["description"]
+                amount = txn_data["amount"]
+                card = txn_data.get("card")
+                description = self.validate_transaction(type, description, amount)
+
+                date = txn_data.get("date") or datetime.now()
+                txn_hash = generate_transaction_hash(date, amount, description, card)
+                row = {
+                    "type": type,
+                    "card": card,
+                    "category": txn_data.get("category"),
+                    "description": description,
+                    "amount": float(amount),
+                    "timestamp": date,
+                    "hash": txn_hash,
+                    "import_source": import_source,
+                    "import_metadata": serialize_import_metadata(
+                        txn_data.get("metadata") or {}
+                    ),
+                }
             except Exception as e:
                 stats["errors"] += 1
-                # Log error but continue processing
-                print(f"Error importing transaction: {e}")
+                # Collect the error and continue; reported in one write below
+                errors.append(f"Error importing transaction: {e}\n")
+                continue
+
+            # Repeats within the same import are duplicates too
+            if txn_hash in seen:
+                stats["duplicates"] += 1
+                continue
+            seen.add(txn_hash)
+            rows.append(row)
+
+        if errors:
+            # stdout carries the MCP JSON-RPC stream, so report on stderr
+            sys.stderr.write("".join(errors))
+
+        # One transaction for the whole import; existing hashes are looked up
+        # and new rows inserted a batch at a time
+        insert_new = (
+            sqlite_insert(Transaction)
+            .on_conflict_do_nothing(index_elements=["hash"])
+            .returning(Transaction.id)
+        )
+        with self.Session() as session:
+            for start in range(0, len(rows), IMPORT_BATCH_SIZE):
+                batch = rows[start : start + IMPORT_BATCH_SIZE]
+                existing = set(
+                    session.scalars(
+                        select(Transaction.hash).where(
+                            Transaction.hash.in_([row["hash"] for row in batch])
+                        )
+                    )
+                )
+                new_rows = [row for row in batch if row["hash"] not in existing]
+                inserted = 0
+                if new_rows:
+                    # DO NOTHING covers rows another writer added meanwhile;
+                    # the returned IDs are only counted, never kept
+                    inserted = sum(1 for _ in session.scalars(insert_new, new_rows))
+                stats["imported"] += inserted
+                stats["duplicates"] += len(batch) - inserted
+            session.commit()
 
         return stats
 
@@ -210,7 +482,7 @@ class Budget:
         description: Optional[str] = None,
         amount: Optional[float] = None,
         category: Optional[str] = None,
-    ) -> bool:
+    ) -> Optional[Transaction]:
         """Update an existing transaction.
 
         Args:
@@ -222,33 +494,54 @@ class Budget:
             category: New category (optional)
 
         Returns:
-            True if updated, False if not found
+            The updated transaction, or None if not found
         """
-        with self.Session() as session:
-            txn = session.query(Transaction).filter_by(id=transaction_id).first()
-            if not txn:
-                return False
-
-            if type is not None:
-                if type not in ["cash", "card"]:
-                    raise ValueError("Type must be 'cash' or 'card'")
-                txn.type = type
-                if type == "cash":
-                    txn.card = None
-
-            if card is not None and txn.type != "cash":
-                txn.card = card
-            if description is not None and description.strip():
-                txn.description = description.strip()
-            if amount is not None:
-                if amount <= 0:
-                    raise ValueError("Amount must be positive")
-                txn.amount = float(amount)
-            if category is not None:
-                txn.category = category
+        changes = {}
+        if type is not None:
+            if type not in ["cash", "card"]:
+                raise ValueError("Type must be 'cash' or 'card'")
+            changes["type"] = type
+            if type == "cash":
+                changes["card"] = None
+
+        if card is not None and type != "cash":
+            if type == "card":
+                changes["card"] = card
+            else:
+                # Type unchanged: cash transactions keep no card. SET
+                # expressions see the row's current values.
+                changes["card"] = case(
+                    (Transaction.type == "cash", Transaction.card), else_=card
+                )
+        if description is not None:
+            description = description.strip()
+            if description:
+                changes["description"] = description
+        if amount is not None:
+            if amount <= 0:
+                raise ValueError("Amount must be positive")
+            changes["amount"] = float(amount)
+        if category is not None:
+            changes["category"] = category
 
+        with self.Session() as session:
+            if not changes:
+                return session.get(Transaction, transaction_id)
+
+            # One UPDATE ... RETURNING instead of a SELECT, a flush and a
+            # re-read of the changed row
+            txn = session.scalars(
+                update(Transaction)
+                .where(Transaction.id == transaction_id)
+                .values(changes)
+                .returning(Transaction),
+                execution_options={"synchronize_session": False},
+            ).first()
             session.commit()
-            return True
+            if txn is not None:
+                # SQLite's RETURNING yields whole-number REAL values as int
+                set_committed_value(txn, "amount", float(txn.amount))
+            return txn
 
     def delete_transaction(self, transaction_id: int) -> bool:
         """Delete a transaction.
@@ -260,12 +553,14 @@ class Budget:
             True if deleted, False if not found
         """
         with self.Session() as session:
-            txn = session.query(Transaction).filter_by(id=transaction_id).first()
-            if txn:
-                session.delete(txn)
-                session.commit()
-                return True
-            return False
+            # Delete by primary key directly; no need to load the row first
+            result = session.execute(
+                delete(Transaction)
+                .where(Transaction.id == transaction_id)
+                .execution_options(synchronize_session=False)
+            )
+            session.commit()
+            return result.rowcount > 0
 
     def get_transaction(self, transaction_id: int) -> Optional[Transaction]:
         """Get a transaction by ID.
@@ -277,7 +572,7 @@ class Budget:
             Transaction or None if not found
         """
         with self.Session() as session:
-            return session.query(Transaction).filter_by(id=transaction_id).first()
+            return session.get(Transaction, transaction_id)
 
     def get_recent_transactions(self, limit: int = 10) -> List[Transaction]:
         """Get recent transactions.
@@ -305,6 +600,7 @@ class Budget:
         end_date: Optional[str] = None,
         min_amount: Optional[float] = None,
         max_amount: Optional[float] = None,
+        limit: Optional[int] = None,
     ) -> List[Transaction]:
         """Search transactions with filters.
 
@@ -312,36 +608,181 @@ class Budget:
             query: Text to search in description/card
             category: Filter by category
             card: Filter by card
-            start_date: Start date filter
-            end_date: End date filter
+            start_date: Start date filter (YYYY-MM-DD or ISO timestamp)
+            end_date: End date filter, inclusive (YYYY-MM-DD or ISO timestamp)
             min_amount: Minimum amount
             max_amount: Maximum amount
+            limit: Maximum number of transactions (capped at MAX_SEARCH_RESULTS)
 
         Returns:
-            List of matching transactions
+            List of matching transactions (newest first)
+
+        Raises:
+            ValueError: If the search text exceeds MAX_QUERY_LENGTH or a date
+                is not in ISO format
+        """
+        # A zero limit can never return rows; skip the database round trip
+        if limit is not None and limit <= 0:
+            return []
+
+        stmt = self._search_statement(
+            query=query,
+            category=category,
+            card=card,
+            start_date=start_date,
+            end_date=end_date,
+            min_amount=min_amount,
+            max_amount=max_amount,
+        )
+        if stmt is None:
+            return []
+        limit = MAX_SEARCH_RESULTS if limit is None else min(limit, MAX_SEARCH_RESULTS)
+        stmt += lambda s: s.limit(limit)
+
+        with self.Session() as session:
+            return list(session.scalars(stmt))
+
+    def iter_transactions(
+        self, batch_size: int = 500, **filters
+    ) -> Iterator[Transaction]:
+        """Stream matching transactions without loading them all at once.
+
+        Rows are fetched from the cursor in batches, so memory stays flat for
+        large result sets. The connection is held until the iterator is
+        exhausted or closed.
+
+        Args:
+            batch_size: Number of rows fetched per batch
+            **filters: Same filters as search_transactions (except limit)
+
+        Yields:
+            Matching transactions (newest first)
         """
+        stmt = self._search_statement(**filters)
+        if stmt is None:
+            return
         with self.Session() as session:
-            q = session.query(Transaction)
+            yield from session.scalars(
+                stmt, execution_options={"yield_per": batch_size}
+            )
+
+    def iter_transaction_rows(
+        self, batch_size: int = 500, **filters
+    ) -> Iterator[Row]:
+        """Stream matching transactions as plain rows for display.
+
+        Like iter_transactions, but selects only the displayed columns
+        (id, type, card, category, description, amount, timestamp) and skips
+        ORM object construction. Rows support attribute access.
+
+        Args:
+            batch_size: Number of rows fetched per batch
+            **filters: Same filters as search_transactions (except limit)
+
+        Yields:
+            Matching rows (newest first)
+        """
+        stmt = self._search_statement(columns_only=True, **filters)
+        if stmt is None:
+            return
+        with self.Session() as session:
+            yield from session.execute(
+                stmt, execution_options={"yield_per": batch_size}
+            )
 
-            if query:
-                search = f"%{query}%"
-                q = q.filter(
-                    Transaction.description.like(search) | Transaction.card.like(search)
+    def _search_statement(
+        self,
+        query: str = "",
+        category: Optional[str] = None,
+        card: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        min_amount: Optional[float] = None,
+        max_amount: Optional[float] = None,
+        columns_only: bool = False,
+    ):
+        """Build the newest-first transaction search for the given filters.
+
+        Each filter is a cached lambda, so SQLAlchemy compiles every filter
+        combination once and later calls only bind new parameter values.
+
+        With columns_only the statement selects the display columns rather
+        than whole Transaction entities.
+
+        Returns:
+            The statement, or None when the filters can never match (such as
+            min_amount above max_amount), so callers skip the round trip
+
+        Raises:
+            ValueError: If the search text exceeds MAX_QUERY_LENGTH or a date
+                is not in ISO format
+        """
+        # MCP clients may send "query": null; treat it as no text filter
+        query = query or ""
+        if len(query) > MAX_QUERY_LENGTH:
+            raise ValueError(
+                f"Search query must be at most {MAX_QUERY_LENGTH} characters"
+            )
+        # Filters that can never match skip the database round trip
+        if (
+            min_amount is not None
+            and max_amount is not None
+            and min_amount > max_amount
+        ):
+            return None
+
+        if columns_only:
+            stmt = lambda_stmt(
+                lambda: select(
+                    Transaction.id,
+                    Transaction.type,
+                    Transaction.card,
+                    Transaction.category,
+                    Transaction.description,
+                    Transaction.amount,
+                    Transaction.timestamp,
                 )
-            if category:
-                q = q.filter(Transaction.category == category)
-            if card:
-                q = q.filter(Transaction.card == card)
-            if start_date:
-                q = q.filter(Transaction.timestamp >= start_date)
-            if end_date:
-                q = q.filter(Transaction.timestamp <= end_date)
-            if min_amount is not None:
-                q = q.filter(Transaction.amount >= min_amount)
-            if max_amount is not None:
-                q = q.filter(Transaction.amount <= max_amount)
-
-            return q.order_by(desc(Transaction.timestamp), desc(Transaction.id)).all()
+            )
+        else:
+            stmt = lambda_stmt(lambda: select(Transaction))
+
+        if self.fts_enabled and len(query) >= FTS_MIN_QUERY_LENGTH:
+            # Quoted as an FTS5 string so the text is matched literally
+            phrase = '"' + query.replace('"', '""') + '"'
+            stmt += lambda s: s.where(
+                Transaction.id.in_(
+                    select(_FTS.c.rowid).where(_FTS.c.transactions_fts.match(phrase))
+                )
+            )
+        elif query:
+            # Too short for a trigram lookup (or no FTS5); scan instead
+            search = f"%{query}%"
+            stmt += lambda s: s.where(
+                Transaction.description.like(search) | Transaction.card.like(search)
+            )
+        if category:
+            stmt += lambda s: s.where(Transaction.category == category)
+        if card:
+            stmt += lambda s: s.where(Transaction.card == card)
+        # Dates become half-open timestamp ranges the indexes can seek on;
+        # a bare end date includes that whole day
+        if start_date:
+            start = _parse_date(start_date)
+            stmt += lambda s: s.where(Transaction.timestamp >= start)
+        if end_date:
+            end = _parse_date(end_date)
+            if len(end_date) == 10:
+                end += timedelta(days=1)
+                stmt += lambda s: s.where(Transaction.timestamp < end)
+            else:
+                stmt += lambda s: s.where(Transaction.timestamp <= end)
+        if min_amount is not None:
+            stmt += lambda s: s.where(Transaction.amount >= min_amount)
+        if max_amount is not None:
+            stmt += lambda s: s.where(Transaction.amount <= max_amount)
+
+        stmt += lambda s: s.order_by(desc(Transaction.timestamp), desc(Transaction.id))
+        return stmt
 
     # Category operations
     def add_category(self, name: str, description: str = "") -> bool:
@@ -354,15 +795,16 @@ class Budget:
         Returns:
             True if added, False if already exists
         """
+        # One INSERT; the unique name constraint decides whether it is new
+        stmt = (
+            sqlite_insert(Category)
+            .values(name=name, description=description)
+            .on_conflict_do_nothing(index_elements=["name"])
+        )
         with self.Session() as session:
-            existing = session.query(Category).filter_by(name=name).first()
-            if existing:
-                return False
-
-            category = Category(name=name, description=description)
-            session.add(category)
+            added = session.execute(stmt).rowcount == 1
             session.commit()
-            return True
+            return added
 
     def get_categories(self) -> List[Category]:
         """Get all categories.
@@ -383,15 +825,15 @@ class Budget:
         Returns:
             True if added, False if already exists
         """
+        stmt = (
+            sqlite_insert(Card)
+            .values(name=name)
+            .on_conflict_do_nothing(index_elements=["name"])
+        )
         with self.Session() as session:
-            existing = session.query(Card).filter_by(name=name).first()
-            if existing:
-                return False
-
-            card = Card(name=name)
-            session.add(card)
+            added = session.execute(stmt).rowcount == 1
             session.commit()
-            return True
+            return added
 
     def get_cards(self) -> List[Card]:
         """Get all cards.
@@ -413,8 +855,11 @@ class Budget:
             Current balance (0.0 if not found)
         """
         with self.Session() as session:
-            balance = session.query(Balance).filter_by(type=type).first()
-            return balance.amount if balance else 0.0
+            # Cached statement reading just the amount column
+            amount = session.scalar(
+                lambda_stmt(lambda: select(Balance.amount).where(Balance.type == type))
+            )
+            return amount if amount is not None else 0.0
 
     def get_all_balances(self) -> Dict[str, float]:
         """Get all balances.
@@ -423,8 +868,9 @@ class Budget:
             Dict mapping balance type to amount
         """
         with self.Session() as session:
-            balances = session.query(Balance).all()
-            return {b.type: b.amount for b in balances}
+            # Plain (type, amount) rows; no ORM objects to build
+            rows = session.execute(select(Balance.type, Balance.amount))
+            return {type: amount for type, amount in rows}
 
     def update_balance(self, type: str, amount: float):
         """Update balance for a type.
@@ -433,13 +879,13 @@ class Budget:
             type: Balance type
             amount: New balance amount
         """
+        # Single upsert instead of a SELECT followed by an UPDATE or INSERT
+        stmt = sqlite_insert(Balance).values(type=type, amount=float(amount))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["type"], set_={"amount": stmt.excluded.amount}
+        )
         with self.Session() as session:
-            balance = session.query(Balance).filter_by(type=type).first()
-            if balance:
-                balance.amount = float(amount)
-            else:
-                balance = Balance(type=type, amount=float(amount))
-                session.add(balance)
+            session.execute(stmt)
             session.commit()
 
     # Spending limit operations
@@ -498,7 +944,8 @@ class Budget:
             period: Time period
 
         Returns:
-            Dict with spent, limit, exceeded, and remaining amounts
+            Dict with has_limit flag plus spent, limit, exceeded, and
+            remaining amounts (all zero when no limit matches)
         """
         with self.Session() as session:
             # Find matching limit
@@ -511,6 +958,7 @@ class Budget:
             limit = limit_query.first()
             if not limit:
                 return {
+                    "has_limit": False,
                     "spent": 0.0,
                     "limit": 0.0,
                     "exceeded": False,
@@ -535,10 +983,10 @@ class Budget:
                     month=1, day=1, hour=0, minute=0, second=0, microsecond=0
                 )
 
-            # Calculate spending
-            txn_query = session.query(Transaction).filter(
-                Transaction.timestamp >= start_date
-            )
+            # Calculate spending in SQL rather than loading every transaction
+            txn_query = session.query(
+                func.coalesce(func.sum(Transaction.amount), 0.0)
+            ).filter(Transaction.timestamp >= start_date)
             if category:
                 txn_query = txn_query.filter(Transaction.category == category)
             if source:
@@ -547,11 +995,12 @@ class Budget:
                 else:
                     txn_query = txn_query.filter(Transaction.card == source)
 
-            spent = sum(txn.amount for txn in txn_query.all())
+            spent = txn_query.scalar()
             exceeded = spent > limit.limit_amount
             remaining = max(0.0, limit.limit_amount - spent)
 
             return {
+                "has_limit": True,
                 "spent": spent,
                 "limit": limit.limit_amount,
                 "exceeded": exceeded,
@@ -562,28 +1011,43 @@ class Budget:
     def get_daily_spending(self, days: int = 30) -> List[Tuple[str, float]]:
         """Get daily spending for the last N days.
 
+        The window starts exactly N days before now, so the first day only
+        counts transactions from that time on. Later days are whole and are
+        read from the pre-aggregated daily_totals table, so the cost is one
+        row per day rather than one row per transaction.
+
         Args:
             days: Number of days to include
 
         Returns:
             List of (date, total_spent) tuples
         """
+        start = datetime.now() - timedelta(days=days)
+        first_day = start.strftime("%Y-%m-%d")
+        next_midnight = start.replace(
+            hour=0, minute=0, second=0, microsecond=0
+        ) + timedelta(days=1)
+
         with self.Session() as session:
-            start_date = datetime.now() - timedelta(days=days)
-            txns = (
-                session.query(Transaction)
-                .filter(Transaction.timestamp >= start_date)
-                .all()
+            # Only the partial first day is summed from transactions
+            first_total, first_count = session.execute(
+                select(
+                    func.coalesce(func.sum(Transaction.amount), 0.0), func.count()
+                ).where(
+                    Transaction.timestamp >= start,
+                    Transaction.timestamp < next_midnight,
+                )
+            ).one()
+            daily = [(first_day, first_total)] if first_count else []
+
+            # Rows arrive already ordered by day, so no dict or re-sort is needed
+            rows = (
+                session.query(DailyTotal.day, DailyTotal.total)
+                .filter(DailyTotal.day > first_day)
+                .order_by(DailyTotal.day)
             )
-
-            # Group by date
-            daily = {}
-            for txn in txns:
-                date_str = txn.timestamp.strftime("%Y-%m-%d")
-                daily[date_str] = daily.get(date_str, 0.0) + txn.amount
-
-            # Return sorted list
-            return sorted(daily.items())
+            daily.extend((day, total) for day, total in rows)
+            return daily
 
     def get_spending_by_category(self, year: int, month: int) -> Dict[str, float]:
         """Get spending breakdown by category for a month.
@@ -593,28 +1057,85 @@ class Budget:
             month: Month (1-12)
 
         Returns:
-            Dict mapping category to total spent
+            Dict mapping category to total spent, largest total first
+
+        Completed months are served from monthly_report_cache once computed;
+        the current month is always aggregated from transactions.
         """
-        with self.Session() as session:
-            start_date = datetime(year, month, 1)
-            if month == 12:
-                end_date = datetime(year + 1, 1, 1)
-            else:
-                end_date = datetime(year, month + 1, 1)
+        start_date = datetime(year, month, 1)
+        if month == 12:
+            end_date = datetime(year + 1, 1, 1)
+        else:
+            end_date = datetime(year, month + 1, 1)
 
-            txns = (
-                session.query(Transaction)
-                .filter(
+        this_month = datetime.now().replace(
+            day=1, hour=0, minute=0, second=0, microsecond=0
+        )
+        cacheable = end_date <= this_month
+
+        with self.Session() as session:
+            if not cacheable:
+                aggregate = lambda_stmt(
+                    lambda: select(_CATEGORY_KEY, _CATEGORY_TOTAL)
+                    .where(
+                        Transaction.timestamp >= start_date,
+                        Transaction.timestamp < end_date,
+                    )
+                    .group_by(_CATEGORY_KEY)
+                    .order_by(desc(_CATEGORY_TOTAL))
+                )
+                return {cat: total for cat, total in session.execute(aggregate)}
+
+            # lambda_stmt caches the constructed and compiled statement;
+            # only the bound year/month change between calls
+            read_cache = lambda_stmt(
+                lambda: select(MonthlyReportCache.key, MonthlyReportCache.total)
+                .where(
+                    MonthlyReportCache.year == year,
+                    MonthlyReportCache.month == month,
+                    MonthlyReportCache.kind == "category",
+                )
+                .order_by(desc(MonthlyReportCache.total))
+            )
+            spending = {cat: total for cat, total in session.execute(read_cache)}
+            if spending:
+                return spending
+
+            # A month with no transactions caches nothing, so skip the write
+            # transaction entirely rather than open one on every call
+            any_row = lambda_stmt(
+                lambda: select(Transaction.id)
+                .where(
                     Transaction.timestamp >= start_date,
                     Transaction.timestamp < end_date,
                 )
-                .all()
+                .limit(1)
             )
-
-            # Group by category
-            by_category = {}
-            for txn in txns:
-                cat = txn.category or "Uncategorized"
-                by_category[cat] = by_category.get(cat, 0.0) + txn.amount
-
-            return by_category
+            if session.execute(any_row).first() is None:
+                return {}
+
+            # INSERT ... SELECT aggregates inside the write transaction, so a
+            # concurrent write is either counted here or invalidates these
+            # rows afterwards; the totals are then read back before commit
+            session.execute(
+                sqlite_insert(MonthlyReportCache)
+                .from_select(
+                    ["year", "month", "kind", "key", "total"],
+                    select(
+                        literal(year),
+                        literal(month),
+                        literal("category"),
+                        _CATEGORY_KEY,
+                        _CATEGORY_TOTAL,
+                    )
+                    .where(
+                        Transaction.timestamp >= start_date,
+                        Transaction.timestamp < end_date,
+                    )
+                    .group_by(_CATEGORY_KEY),
+                )
+                .on_conflict_do_nothing()
+            )
+            spending = {cat: total for cat, total in session.execute(read_cache)}
+            session.commit()
+            return spending
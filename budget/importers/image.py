@@ -3,7 +3,7 @@
 from pathlib import Path
 from typing import List, Optional
 
-from PIL import Image
+from PIL import Image, ImageEnhance
 import pytesseract
 
 
@@ -204,8 +204,6 @@ class ImageImporter:
         image = new_image.convert("L")
 
         # Increase contrast to improve OCR
-        from PIL import ImageEnhance
-
         enhancer = ImageEnhance.Contrast(image)
         image = enhancer.enhance(2)
 
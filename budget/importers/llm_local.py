@@ -1,6 +1,7 @@
 """Local LLM-based transaction extraction using LM Studio or other OpenAI-compatible APIs."""
 
 import base64
+import io
 import json
 import os
 from datetime import datetime
@@ -209,8 +210,6 @@ JSON array:"""
         Returns:
             Base64 encoded string
         """
-        import io
-
         buffer = io.BytesIO()
         image.save(buffer, format="JPEG")
         return base64.b64encode(buffer.getvalue()).decode("utf-8")
@@ -1,16 +1,41 @@
 """Tool handlers for the Budget Tracker MCP server."""
 
+import asyncio
+import math
+import time
+from contextlib import closing
 from datetime import datetime
-from typing import Any
+from itertools import islice
+from typing import Any, Optional
 
 from mcp.types import TextContent
 
-from budget.budget import Budget
+from budget.budget import MAX_SEARCH_RESULTS, Budget
+
+_REQUIRED_TXN_FIELDS = ("type", "description", "amount")
+
+# Optional tool arguments forwarded to Budget only when the caller supplied them
+_UPDATE_FIELDS = ("type", "card", "description", "amount", "category")
+_SEARCH_FIELDS = (
+    "query",
+    "category",
+    "card",
+    "start_date",
+    "end_date",
+    "min_amount",
+    "max_amount",
+)
 
 
 def format_transaction(txn: Any) -> str:
     """Format a transaction for display."""
-    date = txn.timestamp.strftime("%Y-%m-%d %H:%M") if txn.timestamp else "N/A"
+    ts = txn.timestamp
+    # f-string formatting avoids strftime's per-call locale handling
+    date = (
+        f"{ts.year:04d}-{ts.month:02d}-{ts.day:02d} {ts.hour:02d}:{ts.minute:02d}"
+        if ts
+        else "N/A"
+    )
     card_str = f" ({txn.card})" if txn.card else ""
     cat_str = f" [{txn.category}]" if txn.category else ""
     return f"#{txn.id} {date} - {txn.description}{card_str}{cat_str}: ${txn.amount:.2f}"
@@ -25,7 +50,8 @@ class TransactionHandlers:
 
     async def handle_add_transaction(self, arguments: dict[str, Any]) -> list[TextContent]:
         """Handle adding a single transaction."""
-        txn_id = self.budget.add_transaction(
+        txn_id = await asyncio.to_thread(
+            self.budget.add_transaction,
             type=arguments["type"],
             description=arguments["description"],
             amount=arguments["amount"],
@@ -50,27 +76,22 @@ class TransactionHandlers:
 
         results = {"success": 0, "failed": 0, "errors": []}
         added_ids = []
+        valid = []
 
         for idx, txn in enumerate(transactions):
             try:
                 # Validate required fields
-                if not all(k in txn for k in ["type", "description", "amount"]):
+                if not all(k in txn for k in _REQUIRED_TXN_FIELDS):
                     results["failed"] += 1
                     results["errors"].append(
                         f"Transaction {idx + 1}: Missing required fields"
                     )
                     continue
 
-                # Add the transaction
-                txn_id = self.budget.add_transaction(
-                    type=txn["type"],
-                    description=txn["description"],
-                    amount=txn["amount"],
-                    card=txn.get("card"),
-                    category=txn.get("category"),
+                self.budget.validate_transaction(
+                    txn["type"], txn["description"], txn["amount"]
                 )
-                results["success"] += 1
-                added_ids.append(txn_id)
+                valid.append(txn)
 
             except ValueError as e:
                 results["failed"] += 1
@@ -79,6 +100,15 @@ class TransactionHandlers:
                 results["failed"] += 1
                 results["errors"].append(f"Transaction {idx + 1}: Unexpected error - {str(e)}")
 
+        # Insert every valid transaction in one database transaction
+        if valid:
+            try:
+                added_ids = await asyncio.to_thread(self.budget.add_transactions, valid)
+                results["success"] = len(added_ids)
+            except Exception as e:
+                results["failed"] += len(valid)
+                results["errors"].append(f"Unexpected error - {str(e)}")
+
         # Build response message
         response = f"Bulk Transaction Import Results:\n\n"
         response += f"✓ Successfully added: {results['success']}\n"
@@ -101,52 +131,59 @@ class TransactionHandlers:
         category = arguments.get("category")
         card = arguments.get("card")
 
-        if query or category or card:
-            txns = self.budget.search_transactions(
-                query=query or "", category=category, card=card
-            )
-        else:
-            txns = self.budget.get_recent_transactions(limit)
+        filters = {"query": query or "", "category": category, "card": card}
+        # Unfiltered listings read the newest-first index and stop at limit,
+        # which is capped like a search so no call streams the whole table
+        limit = min(max(0, int(limit)), MAX_SEARCH_RESULTS)
+        lines = await asyncio.to_thread(self._format_matches, filters, limit)
 
-        if not txns:
+        if not lines:
             return [TextContent(type="text", text="No transactions found")]
 
-        result = "Recent Transactions:\n\n"
-        for txn in txns[:limit]:
-            result += format_transaction(txn) + "\n"
+        result = "Recent Transactions:\n\n" + "".join(lines)
 
         return [TextContent(type="text", text=result)]
 
     async def handle_search_transactions(self, arguments: dict[str, Any]) -> list[TextContent]:
         """Handle searching transactions."""
-        txns = self.budget.search_transactions(
-            query=arguments.get("query", ""),
-            category=arguments.get("category"),
-            card=arguments.get("card"),
-            start_date=arguments.get("start_date"),
-            end_date=arguments.get("end_date"),
-            min_amount=arguments.get("min_amount"),
-            max_amount=arguments.get("max_amount"),
+        filters = {f: arguments[f] for f in _SEARCH_FIELDS if f in arguments}
+        # One row past the cap tells a truncated result from an exact fit
+        lines = await asyncio.to_thread(
+            self._format_matches, filters, MAX_SEARCH_RESULTS + 1
         )
 
-        if not txns:
+        if not lines:
             return [TextContent(type="text", text="No matching transactions found")]
 
-        result = f"Found {len(txns)} transactions:\n\n"
-        for txn in txns:
-            result += format_transaction(txn) + "\n"
+        if len(lines) > MAX_SEARCH_RESULTS:
+            del lines[MAX_SEARCH_RESULTS:]
+            header = (
+                f"Found more than {MAX_SEARCH_RESULTS} transactions, "
+                f"showing first {MAX_SEARCH_RESULTS}:\n\n"
+            )
+        else:
+            header = f"Found {len(lines)} transactions:\n\n"
+        result = header + "".join(lines)
 
         return [TextContent(type="text", text=result)]
 
+    def _format_matches(
+        self, filters: dict[str, Any], limit: int = MAX_SEARCH_RESULTS
+    ) -> list[str]:
+        """Format matching transactions as they stream from the database.
+
+        Only the displayed columns are fetched and only the formatted lines
+        are kept, and output stops after limit rows.
+        """
+        # closing() releases the connection even when islice stops early
+        with closing(self.budget.iter_transaction_rows(**filters)) as matches:
+            return [f"{format_transaction(txn)}\n" for txn in islice(matches, limit)]
+
     async def handle_update_transaction(self, arguments: dict[str, Any]) -> list[TextContent]:
         """Handle updating a transaction."""
-        success = self.budget.update_transaction(
-            transaction_id=int(arguments["transaction_id"]),
-            type=arguments.get("type"),
-            card=arguments.get("card"),
-            description=arguments.get("description"),
-            amount=arguments.get("amount"),
-            category=arguments.get("category"),
+        changes = {f: arguments[f] for f in _UPDATE_FIELDS if f in arguments}
+        success = await asyncio.to_thread(
+            self.budget.update_transaction, int(arguments["transaction_id"]), **changes
         )
 
         if success:
@@ -166,7 +203,9 @@ class TransactionHandlers:
 
     async def handle_delete_transaction(self, arguments: dict[str, Any]) -> list[TextContent]:
         """Handle deleting a transaction."""
-        success = self.budget.delete_transaction(int(arguments["transaction_id"]))
+        success = await asyncio.to_thread(
+            self.budget.delete_transaction, int(arguments["transaction_id"])
+        )
 
         if success:
             return [
@@ -193,7 +232,8 @@ class CategoryHandlers:
 
     async def handle_add_category(self, arguments: dict[str, Any]) -> list[TextContent]:
         """Handle adding a category."""
-        success = self.budget.add_category(
+        success = await asyncio.to_thread(
+            self.budget.add_category,
             name=arguments["name"], description=arguments.get("description", "")
         )
 
@@ -214,15 +254,15 @@ class CategoryHandlers:
 
     async def handle_list_categories(self, arguments: dict[str, Any]) -> list[TextContent]:
         """Handle listing categories."""
-        categories = self.budget.get_categories()
+        categories = await asyncio.to_thread(self.budget.get_categories)
 
         if not categories:
             return [TextContent(type="text", text="No categories found")]
 
-        result = "Available Categories:\n\n"
-        for cat in categories:
-            desc = f" - {cat.description}" if cat.description else ""
-            result += f"• {cat.name}{desc}\n"
+        result = "Available Categories:\n\n" + "".join(
+            f"• {cat.name} - {cat.description}\n" if cat.description else f"• {cat.name}\n"
+            for cat in categories
+        )
 
         return [TextContent(type="text", text=result)]
 
@@ -236,7 +276,7 @@ class CardHandlers:
 
     async def handle_add_card(self, arguments: dict[str, Any]) -> list[TextContent]:
         """Handle adding a card."""
-        success = self.budget.add_card(name=arguments["name"])
+        success = await asyncio.to_thread(self.budget.add_card, name=arguments["name"])
 
         if success:
             return [
@@ -254,14 +294,12 @@ class CardHandlers:
 
     async def handle_list_cards(self, arguments: dict[str, Any]) -> list[TextContent]:
         """Handle listing cards."""
-        cards = self.budget.get_cards()
+        cards = await asyncio.to_thread(self.budget.get_cards)
 
         if not cards:
             return [TextContent(type="text", text="No cards found")]
 
-        result = "Payment Cards:\n\n"
-        for card in cards:
-            result += f"• {card.name}\n"
+        result = "Payment Cards:\n\n" + "".join(f"• {card.name}\n" for card in cards)
 
         return [TextContent(type="text", text=result)]
 
@@ -275,7 +313,7 @@ class BalanceHandlers:
 
     async def handle_get_balance(self, arguments: dict[str, Any]) -> list[TextContent]:
         """Handle getting a balance."""
-        balance = self.budget.get_balance(arguments["type"])
+        balance = await asyncio.to_thread(self.budget.get_balance, arguments["type"])
         return [
             TextContent(
                 type="text",
@@ -285,23 +323,25 @@ class BalanceHandlers:
 
     async def handle_get_all_balances(self, arguments: dict[str, Any]) -> list[TextContent]:
         """Handle getting all balances."""
-        balances = self.budget.get_all_balances()
+        balances = await asyncio.to_thread(self.budget.get_all_balances)
 
         if not balances:
             return [TextContent(type="text", text="No balances found")]
 
-        result = "Current Balances:\n\n"
-        for balance_type, amount in balances.items():
-            result += f"• {balance_type}: ${amount:.2f}\n"
-
-        total = sum(balances.values())
-        result += f"\nTotal: ${total:.2f}"
+        total = math.fsum(balances.values())
+        rows = "".join(
+            f"• {balance_type}: ${amount:.2f}\n"
+            for balance_type, amount in balances.items()
+        )
+        result = f"Current Balances:\n\n{rows}\nTotal: ${total:.2f}"
 
         return [TextContent(type="text", text=result)]
 
     async def handle_update_balance(self, arguments: dict[str, Any]) -> list[TextContent]:
         """Handle updating a balance."""
-        self.budget.update_balance(type=arguments["type"], amount=arguments["amount"])
+        await asyncio.to_thread(
+            self.budget.update_balance, type=arguments["type"], amount=arguments["amount"]
+        )
         return [
             TextContent(
                 type="text",
@@ -319,14 +359,15 @@ class LimitHandlers:
 
     async def handle_set_spending_limit(self, arguments: dict[str, Any]) -> list[TextContent]:
         """Handle setting a spending limit."""
-        self.budget.set_spending_limit(
+        period = arguments.get("period", "monthly")
+        await asyncio.to_thread(
+            self.budget.set_spending_limit,
             limit_amount=arguments["limit_amount"],
-            period=arguments.get("period", "monthly"),
+            period=period,
             category=arguments.get("category"),
             source=arguments.get("source"),
         )
 
-        period = arguments.get("period", "monthly")
         return [
             TextContent(
                 type="text",
@@ -338,20 +379,21 @@ class LimitHandlers:
         self, arguments: dict[str, Any]
     ) -> list[TextContent]:
         """Handle checking spending limits."""
-        result = self.budget.check_spending_limit(
+        period = arguments.get("period", "monthly")
+        result = await asyncio.to_thread(
+            self.budget.check_spending_limit,
             category=arguments.get("category"),
             source=arguments.get("source"),
-            period=arguments.get("period", "monthly"),
+            period=period,
         )
 
-        if result["limit"] == 0:
+        if not result["has_limit"]:
             return [
                 TextContent(
                     type="text", text="No spending limit set for these criteria"
                 )
             ]
 
-        period = arguments.get("period", "monthly")
         response = f"Spending Limit Check ({period}):\n\n"
         response += f"• Limit: ${result['limit']:.2f}\n"
         response += f"• Spent: ${result['spent']:.2f}\n"
@@ -371,7 +413,8 @@ class ReportHandlers:
     async def handle_get_daily_spending(self, arguments: dict[str, Any]) -> list[TextContent]:
         """Handle getting daily spending."""
         days = arguments.get("days", 30)
-        daily_spending = self.budget.get_daily_spending(days)
+        # Run the query off the event loop so concurrent tool calls overlap
+        daily_spending = await asyncio.to_thread(self.budget.get_daily_spending, days)
 
         if not daily_spending:
             return [
@@ -380,14 +423,13 @@ class ReportHandlers:
                 )
             ]
 
-        result = f"Daily Spending (Last {days} days):\n\n"
-        for date, amount in daily_spending:
-            result += f"{date}: ${amount:.2f}\n"
-
-        total = sum(amount for _, amount in daily_spending)
+        total = math.fsum(amount for _, amount in daily_spending)
         avg = total / len(daily_spending)
-        result += f"\nTotal: ${total:.2f}"
-        result += f"\nAverage: ${avg:.2f}/day"
+        rows = "".join(f"{date}: ${amount:.2f}\n" for date, amount in daily_spending)
+        result = (
+            f"Daily Spending (Last {days} days):\n\n{rows}"
+            f"\nTotal: ${total:.2f}\nAverage: ${avg:.2f}/day"
+        )
 
         return [TextContent(type="text", text=result)]
 
@@ -399,7 +441,9 @@ class ReportHandlers:
         year = arguments.get("year", now.year)
         month = arguments.get("month", now.month)
 
-        spending = self.budget.get_spending_by_category(year, month)
+        spending = await asyncio.to_thread(
+            self.budget.get_spending_by_category, year, month
+        )
 
         if not spending:
             return [
@@ -408,25 +452,76 @@ class ReportHandlers:
                 )
             ]
 
-        total = sum(spending.values())
-
-        result = f"Spending by Category ({year}-{month:02d}):\n\n"
-        for category, amount in sorted(
-            spending.items(), key=lambda x: x[1], reverse=True
-        ):
-            pct = (amount / total * 100) if total > 0 else 0
-            result += f"• {category}: ${amount:.2f} ({pct:.1f}%)\n"
+        total = math.fsum(spending.values())
+        # One division for the whole report; each row is then a multiply
+        scale = 100.0 / total if total > 0 else 0.0
 
-        result += f"\nTotal: ${total:.2f}"
+        # Budget returns categories already ranked by amount
+        rows = "".join(
+            f"• {category}: ${amount:.2f} ({amount * scale:.1f}%)\n"
+            for category, amount in spending.items()
+        )
+        result = (
+            f"Spending by Category ({year}-{month:02d}):\n\n{rows}\nTotal: ${total:.2f}"
+        )
 
         return [TextContent(type="text", text=result)]
 
 
+# Read tools whose results are reused for a short time for identical arguments
+CACHED_TOOLS = frozenset(
+    {
+        "list_transactions",
+        "search_transactions",
+        "list_categories",
+        "list_cards",
+        "get_balance",
+        "get_all_balances",
+        "check_spending_limit",
+        "get_daily_spending",
+        "get_spending_by_category",
+    }
+)
+# Tools that change data; any call drops every cached read result
+WRITE_TOOLS = frozenset(
+    {
+        "add_transaction",
+        "add_multiple_transactions",
+        "update_transaction",
+        "delete_transaction",
+        "add_category",
+        "add_card",
+        "update_balance",
+        "set_spending_limit",
+    }
+)
+READ_CACHE_TTL = 2.0
+READ_CACHE_SIZE = 1024
+MAX_IN_FLIGHT = 64
+
+
 class ToolRouter:
     """Routes tool calls to appropriate handlers."""
 
-    def __init__(self, budget: Budget):
-        """Initialize router with all handlers."""
+    def __init__(
+        self, budget: Budget, max_in_flight: Optional[int] = MAX_IN_FLIGHT
+    ):
+        """Initialize router with all handlers.
+
+        Args:
+            budget: Budget instance shared by all handlers
+            max_in_flight: Tool calls allowed to run at once; calls beyond
+                this are rejected instead of queueing behind the database
+                (None for no bound)
+        """
+        self.max_in_flight = max_in_flight
+        self._in_flight = 0
+
+        # (tool, arguments) -> (expiry, result); writes bump the generation
+        # so reads that overlapped them do not store their results
+        self._read_cache: dict[tuple, tuple[float, list[TextContent]]] = {}
+        self._generation = 0
+
         self.transaction_handlers = TransactionHandlers(budget)
         self.category_handlers = CategoryHandlers(budget)
         self.card_handlers = CardHandlers(budget)
@@ -463,12 +558,79 @@ class ToolRouter:
 
     async def route(self, name: str, arguments: dict[str, Any]) -> list[TextContent]:
         """Route a tool call to the appropriate handler."""
-        if name not in self.routes:
+        handler = self.routes.get(name)
+        if handler is None:
             return [TextContent(type="text", text=f"Unknown tool: {name}")]
 
+        # Admission control: shed load rather than build an unbounded backlog
+        if self.max_in_flight is not None and self._in_flight >= self.max_in_flight:
+            return [TextContent(type="text", text="Error: Server busy, please retry")]
+
+        self._in_flight += 1
+        try:
+            if name in CACHED_TOOLS:
+                return await self._cached_route(name, handler, arguments)
+            return await self._write_route(name, handler, arguments)
+        finally:
+            self._in_flight -= 1
+
+    async def _write_route(
+        self, name: str, handler: Any, arguments: dict[str, Any]
+    ) -> list[TextContent]:
+        """Run an uncached tool, invalidating cached reads if it writes."""
         try:
-            return await self.routes[name](arguments)
-        except ValueError as e:
-            return [TextContent(type="text", text=f"Error: {str(e)}")]
+            return await handler(arguments)
         except Exception as e:
-            return [TextContent(type="text", text=f"Unexpected error: {str(e)}")]
+            return self._error_result(e)
+        finally:
+            if name in WRITE_TOOLS:
+                # Invalidate once the write has finished, so reads that ran
+                # alongside it cannot leave pre-write results behind
+                self._generation += 1
+                self._read_cache.clear()
+
+    async def _cached_route(
+        self, name: str, handler: Any, arguments: dict[str, Any]
+    ) -> list[TextContent]:
+        """Serve a read tool from the cache, or run it and cache the result."""
+        key = self._cache_key(name, arguments)
+        now = time.monotonic()
+        cached = self._read_cache.pop(key, None)
+        if cached is not None and cached[0] > now:
+            # Re-insert so the dict order tracks recency (LRU)
+            self._read_cache[key] = cached
+            return cached[1]
+
+        generation = self._generation
+        try:
+            result = await handler(arguments)
+        except Exception as e:
+            # Errors are returned but never cached
+            return self._error_result(e)
+
+        if key is not None and generation == self._generation:
+            if len(self._read_cache) >= READ_CACHE_SIZE:
+                # Dicts keep insertion order, so this drops the least recently used
+                del self._read_cache[next(iter(self._read_cache))]
+            self._read_cache[key] = (now + READ_CACHE_TTL, result)
+        return result
+
+    @staticmethod
+    def _cache_key(name: str, arguments: dict[str, Any]) -> Optional[tuple]:
+        """Build the read cache key for a tool call.
+
+        Value types are part of the key, since 1, True and 1.0 compare equal
+        but can validate or coerce differently. Returns None for unhashable
+        argument values (lists, objects), which are never cached.
+        """
+        try:
+            return (name, frozenset((k, type(v), v) for k, v in arguments.items()))
+        except TypeError:
+            return None
+
+    @staticmethod
+    def _error_result(error: Exception) -> list[TextContent]:
+        """Format a handler exception as a tool result."""
+        if isinstance(error, ValueError):
+            return [TextContent(type="text", text=f"Error: {str(error)}")]
+        return [TextContent(type="text", text=f"Unexpected error: {str(error)}")]
@@ -92,6 +92,7 @@ def get_transaction_tools() -> list[Tool]:
                     "query": {
                         "type": "string",
                         "description": "Search text to filter by",
+                        "maxLength": 128,
                     },
                     "category": {
                         "type": "string",
@@ -113,6 +114,7 @@ def get_transaction_tools() -> list[Tool]:
                     "query": {
                         "type": "string",
                         "description": "Text to search in description/card",
+                        "maxLength": 128,
                     },
                     "category": {
                         "type": "string",
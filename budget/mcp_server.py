@@ -4,8 +4,11 @@ This server exposes budget tracking functionality as tools for LLM interaction.
 The server is modular with separate tool definitions and handlers.
 """
 
+import asyncio
 import os
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from typing import Any, Optional
 
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
@@ -18,11 +21,24 @@ from budget.mcp.tools import get_all_tools
 # Initialize the MCP server
 app = Server("budget-tracker")
 
-# Initialize budget instance
-budget = Budget(os.environ.get("BUDGET_DB_NAME", "budget.db"))
 
-# Initialize tool router
-router = ToolRouter(budget)
+@cache
+def get_budget() -> Budget:
+    """Open the budget database on first use.
+
+    Importing this module (e.g. to read the tool list) does not touch the
+    database; the first tool call or server start opens it.
+    """
+    return Budget(os.environ.get("BUDGET_DB_NAME", "budget.db"))
+
+
+@cache
+def get_router() -> ToolRouter:
+    """Create the tool router on first use.
+
+    Calls beyond max_in_flight() get a busy error.
+    """
+    return ToolRouter(get_budget(), max_in_flight=max_in_flight())
 
 
 @app.list_tools()
@@ -34,19 +50,51 @@ async def list_tools() -> list[Tool]:
 @app.call_tool()
 async def call_tool(name: str, arguments: Any) -> list[TextContent]:
     """Route tool calls to appropriate handlers."""
-    return await router.route(name, arguments)
+    return await get_router().route(name, arguments)
+
+
+def db_worker_count() -> int:
+    """Size the database thread pool.
+
+    BUDGET_MAX_WORKERS sets the size outright. Otherwise the usable CPUs are
+    multiplied by BUDGET_WORKER_MULTIPLIER (default 2) and capped at the
+    connection pool size, since more threads would only queue on checkout.
+    """
+    explicit = os.environ.get("BUDGET_MAX_WORKERS")
+    if explicit:
+        return max(1, int(explicit))
+    multiplier = int(os.environ.get("BUDGET_WORKER_MULTIPLIER", "2"))
+    # process_cpu_count honours CPU affinity (e.g. container CPU sets)
+    cpus = os.process_cpu_count() or 1
+    return max(1, min(cpus * multiplier, get_budget().engine.pool.size()))
+
+
+def max_in_flight() -> Optional[int]:
+    """Bound concurrent tool calls at four per database worker.
+
+    BUDGET_MAX_IN_FLIGHT overrides the bound; 0 removes it.
+    """
+    explicit = os.environ.get("BUDGET_MAX_IN_FLIGHT")
+    if explicit:
+        return int(explicit) or None
+    return 4 * db_worker_count()
 
 
 async def async_main():
     """Run the MCP server asynchronously."""
+    # Handlers offload Budget calls with asyncio.to_thread, which uses this
+    executor = ThreadPoolExecutor(
+        max_workers=db_worker_count(), thread_name_prefix="budget-db"
+    )
+    asyncio.get_running_loop().set_default_executor(executor)
+    # Open the database before serving so the first tool call does not wait
+    get_router()
     async with stdio_server() as (read_stream, write_stream):
         await app.run(read_stream, write_stream, app.create_initialization_options())
 
 
 def main():
     """Entry point for the MCP server."""
-    import asyncio
-
     asyncio.run(async_main())
 
 
@@ -1,6 +1,6 @@
 """SQLAlchemy ORM models for the budget tracker."""
 
-from sqlalchemy import Column, DateTime, Float, Integer, String
+from sqlalchemy import Column, DateTime, Float, Index, Integer, String
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.sql import func
 
@@ -41,6 +41,25 @@ class Transaction(Base):
     import_source = Column(String)  # "manual", "pdf", "image", "email"
     import_metadata = Column(String)  # JSON string with additional import info
 
+    __table_args__ = (
+        # Covering index for date-range reports (spending by category, limits)
+        Index(
+            "ix_transactions_report_cover",
+            "timestamp",
+            "amount",
+            "card",
+            "type",
+            "category",
+        ),
+        # Newest-first listings read these in order and stop at LIMIT; the
+        # rowid (id) SQLite appends to every index breaks timestamp ties
+        Index("ix_transactions_time_id", timestamp.desc(), id.desc()),
+        Index("ix_transactions_category_time", "category", "timestamp"),
+        Index("ix_transactions_card_time", "card", "timestamp"),
+        # Amount-range searches (min_amount / max_amount)
+        Index("ix_transactions_amount", "amount"),
+    )
+
 
 class Balance(Base):
     """Account balance model."""
@@ -59,3 +78,141 @@ class SpendingLimit(Base):
     source = Column(String)
     limit_amount = Column(Float, nullable=False)
     period = Column(String, nullable=False)  # "daily", "weekly", "monthly", "yearly"
+
+
+class DailyTotal(Base):
+    """Pre-aggregated spending per calendar day.
+
+    Maintained by the triggers in ``DAILY_TOTAL_TRIGGERS`` so reports can read
+    one row per day instead of re-summing raw transactions.
+    """
+
+    __tablename__ = "daily_totals"
+    day = Column(String, primary_key=True)  # "YYYY-MM-DD"
+    total = Column(Float, nullable=False, default=0.0)
+    txn_count = Column(Integer, nullable=False, default=0)
+
+
+class MonthlyReportCache(Base):
+    """Cached report totals for completed months.
+
+    Rows for a month are dropped by ``REPORT_CACHE_TRIGGERS`` whenever a
+    transaction in that month changes, and recomputed on the next read.
+    """
+
+    __tablename__ = "monthly_report_cache"
+    year = Column(Integer, primary_key=True)
+    month = Column(Integer, primary_key=True)
+    kind = Column(String, primary_key=True)  # e.g. "category"
+    key = Column(String, primary_key=True)
+    total = Column(Float, nullable=False)
+
+
+# SQLite triggers keeping daily_totals in sync with the transactions table
+DAILY_TOTAL_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS daily_totals_after_insert
+    AFTER INSERT ON transactions
+    BEGIN
+        INSERT INTO daily_totals (day, total, txn_count)
+        SELECT date(NEW.timestamp), NEW.amount, 1
+        WHERE NEW.timestamp IS NOT NULL
+        ON CONFLICT(day) DO UPDATE SET
+            total = total + excluded.total,
+            txn_count = txn_count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS daily_totals_after_update
+    AFTER UPDATE OF amount, timestamp ON transactions
+    BEGIN
+        UPDATE daily_totals
+        SET total = total - OLD.amount, txn_count = txn_count - 1
+        WHERE day = date(OLD.timestamp);
+        DELETE FROM daily_totals
+        WHERE day = date(OLD.timestamp) AND txn_count <= 0;
+        INSERT INTO daily_totals (day, total, txn_count)
+        SELECT date(NEW.timestamp), NEW.amount, 1
+        WHERE NEW.timestamp IS NOT NULL
+        ON CONFLICT(day) DO UPDATE SET
+            total = total + excluded.total,
+            txn_count = txn_count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS daily_totals_after_delete
+    AFTER DELETE ON transactions
+    BEGIN
+        UPDATE daily_totals
+        SET total = total - OLD.amount, txn_count = txn_count - 1
+        WHERE day = date(OLD.timestamp);
+        DELETE FROM daily_totals
+        WHERE day = date(OLD.timestamp) AND txn_count <= 0;
+    END
+    """,
+]
+
+# SQLite triggers invalidating cached reports for months whose transactions change
+_INVALIDATE_MONTH = """
+        DELETE FROM monthly_report_cache
+        WHERE year = CAST(strftime('%Y', {row}.timestamp) AS INTEGER)
+          AND month = CAST(strftime('%m', {row}.timestamp) AS INTEGER);"""
+
+REPORT_CACHE_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS monthly_report_cache_after_insert
+    AFTER INSERT ON transactions
+    BEGIN{_INVALIDATE_MONTH.format(row="NEW")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS monthly_report_cache_after_update
+    AFTER UPDATE ON transactions
+    BEGIN{_INVALIDATE_MONTH.format(row="OLD")}{_INVALIDATE_MONTH.format(row="NEW")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS monthly_report_cache_after_delete
+    AFTER DELETE ON transactions
+    BEGIN{_INVALIDATE_MONTH.format(row="OLD")}
+    END
+    """,
+]
+
+# Trigram full-text index over description/card, used by substring searches.
+# External-content table: rows live in transactions, kept in sync by triggers.
+TRANSACTION_FTS_TABLE = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5(
+        description, card,
+        content = 'transactions', content_rowid = 'id', tokenize = 'trigram'
+    )
+    """
+
+TRANSACTION_FTS_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_after_insert
+    AFTER INSERT ON transactions
+    BEGIN
+        INSERT INTO transactions_fts (rowid, description, card)
+        VALUES (NEW.id, NEW.description, NEW.card);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_after_update
+    AFTER UPDATE OF description, card ON transactions
+    BEGIN
+        INSERT INTO transactions_fts (transactions_fts, rowid, description, card)
+        VALUES ('delete', OLD.id, OLD.description, OLD.card);
+        INSERT INTO transactions_fts (rowid, description, card)
+        VALUES (NEW.id, NEW.description, NEW.card);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_after_delete
+    AFTER DELETE ON transactions
+    BEGIN
+        INSERT INTO transactions_fts (transactions_fts, rowid, description, card)
+        VALUES ('delete', OLD.id, OLD.description, OLD.card);
+    END
+    """,
+]
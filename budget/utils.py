@@ -32,8 +32,9 @@ def generate_transaction_hash(
     # Create hash input
     hash_input = f"{date_str}|{amount_str}|{desc_normalized}|{card_normalized}"
 
-    # Generate SHA256 hash
-    return hashlib.sha256(hash_input.encode()).hexdigest()
+    # SHA256 keeps existing stored hashes valid; it is only a dedup key,
+    # so the hash can skip the security-policy checks
+    return hashlib.sha256(hash_input.encode(), usedforsecurity=False).hexdigest()
 
 
 def normalize_description(description: str) -> str:
@@ -45,7 +46,8 @@ def normalize_description(description: str) -> str:
     Returns:
         Normalized description
     """
-    return " ".join(description.lower().strip().split())
+    # split() already drops leading/trailing whitespace
+    return " ".join(description.lower().split())
 
 
 def serialize_import_metadata(metadata: dict) -> str:
@@ -57,7 +59,10 @@ def serialize_import_metadata(metadata: dict) -> str:
     Returns:
         JSON string
     """
-    return json.dumps(metadata, sort_keys=True)
+    if not metadata:
+        return "{}"
+    # Compact separators: smaller rows, and the output stays plain JSON
+    return json.dumps(metadata, sort_keys=True, separators=(",", ":"))
 
 
 def deserialize_import_metadata(metadata_str: Optional[str]) -> dict:
@@ -0,0 +1,38 @@
+"""Shared fixtures for the budget tests."""
+
+import pytest
+
+from budget import Budget
+from budget.models import Base
+
+
+@pytest.fixture(autouse=True)
+def _isolated_db_name(monkeypatch):
+    """Stop BUDGET_DB_NAME from redirecting a test's own Budget elsewhere."""
+    monkeypatch.delenv("BUDGET_DB_NAME", raising=False)
+
+
+@pytest.fixture(scope="session")
+def shared_budget(tmp_path_factory):
+    """Create one temporary budget tracker for the whole test session."""
+    # pytest owns the directory and prunes old runs, so no manual cleanup
+    db_path = tmp_path_factory.mktemp("db") / "budget.db"
+    # BUDGET_DB_NAME would override the path, and the per-test reset
+    # deletes every row, so never let it point the tests at a real database
+    with pytest.MonkeyPatch.context() as mp:
+        mp.delenv("BUDGET_DB_NAME", raising=False)
+        budget = Budget(str(db_path))
+    assert budget.db_name == str(db_path)
+    yield budget
+    budget.close()
+
+
+@pytest.fixture
+def budget(shared_budget):
+    """Give each test the shared tracker, emptied again afterwards."""
+    yield shared_budget
+
+    # Schema setup runs once per session; only the rows are reset per test
+    with shared_budget.engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
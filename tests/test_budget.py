@@ -1,29 +1,19 @@
 """Tests for the Budget class."""
 
 import os
-import tempfile
+import subprocess
+import sys
 from datetime import datetime
+from pathlib import Path
 
 import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 
+import budget.budget as budget_module
 from budget import Budget
 
 
-@pytest.fixture
-def budget():
-    """Create a temporary budget tracker for testing."""
-    # Use a temporary database file
-    fd, db_path = tempfile.mkstemp(suffix=".db")
-    os.close(fd)
-
-    budget = Budget(db_path)
-    yield budget
-
-    # Clean up
-    if os.path.exists(db_path):
-        os.unlink(db_path)
-
-
 class TestTransactions:
     """Test transaction operations."""
 
@@ -48,26 +38,84 @@ class TestTransactions:
         assert txn.card == "Visa"
         assert txn.type == "card"
 
-    def test_add_transaction_validation(self, budget):
+    @pytest.mark.parametrize(
+        "type, description, amount, error",
+        [
+            ("cash", "", 5.0, "Description cannot be empty"),
+            ("cash", "   ", 5.0, "Description cannot be empty"),
+            ("cash", "Test", -5.0, "Amount must be positive"),
+            ("cash", "Test", 0.0, "Amount must be positive"),
+            ("invalid", "Test", 5.0, "Type must be 'cash' or 'card'"),
+        ],
+    )
+    def test_add_transaction_validation(self, budget, type, description, amount, error):
         """Test transaction validation."""
-        with pytest.raises(ValueError, match="Description cannot be empty"):
-            budget.add_transaction("cash", "", 5.0)
+        with pytest.raises(ValueError) as excinfo:
+            budget.add_transaction(type, description, amount)
+        assert str(excinfo.value) == error
+
+    def test_add_transactions(self, budget):
+        """Test adding several transactions at once."""
+        ids = budget.add_transactions(
+            [
+                {"type": "cash", "description": " Coffee ", "amount": 5.0},
+                {"type": "card", "description": "Lunch", "amount": 12, "card": "Visa"},
+            ]
+        )
+        assert len(ids) == 2
+        assert budget.get_transaction(ids[0]).description == "Coffee"
+        assert budget.get_transaction(ids[1]).card == "Visa"
 
+        # One invalid entry rejects the whole batch
         with pytest.raises(ValueError, match="Amount must be positive"):
-            budget.add_transaction("cash", "Test", -5.0)
-
-        with pytest.raises(ValueError, match="Type must be"):
-            budget.add_transaction("invalid", "Test", 5.0)
+            budget.add_transactions(
+                [
+                    {"type": "cash", "description": "Tea", "amount": 3.0},
+                    {"type": "cash", "description": "Refund", "amount": -1.0},
+                ]
+            )
+        assert len(budget.get_recent_transactions(10)) == 2
+
+    def test_import_transactions(self, budget, capsys):
+        """Test importing transactions with deduplication."""
+        date = datetime(2024, 1, 5)
+        budget.add_transaction_safe("card", "Coffee", 3.0, date=date, card="Visa")
+        rows = [
+            {"description": "Coffee", "amount": 3.0, "date": date, "card": "Visa"},
+            {"description": "Tea", "amount": 2.0, "date": date},
+            {"description": "Tea", "amount": 2.0, "date": date},
+            {"description": "", "amount": 2.0},
+        ]
+
+        stats = budget.import_transactions(rows, "pdf")
+        assert stats == {"total": 4, "imported": 1, "duplicates": 2, "errors": 1}
+        # Errors go to stderr, keeping stdout free for the MCP stream
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert captured.err.count("Error importing transaction") == 1
+
+        stats = budget.import_transactions(rows, "pdf")
+        assert stats == {"total": 4, "imported": 0, "duplicates": 3, "errors": 1}
 
     def test_update_transaction(self, budget):
         """Test updating a transaction."""
         txn_id = budget.add_transaction("cash", "Coffee", 5.50)
 
-        assert budget.update_transaction(txn_id, description="Tea", amount=3.50)
-
-        txn = budget.get_transaction(txn_id)
+        txn = budget.update_transaction(txn_id, description="Tea", amount=3.50)
         assert txn.description == "Tea"
         assert txn.amount == 3.50
+        assert budget.get_transaction(txn_id).description == "Tea"
+
+        # Whole-number amounts still come back as floats
+        txn = budget.update_transaction(txn_id, amount=9.0)
+        assert isinstance(txn.amount, float)
+        txn = budget.update_transaction(txn_id, category="Food")
+        assert isinstance(txn.amount, float)
+
+        # Cash transactions never pick up a card
+        assert budget.update_transaction(txn_id, card="Visa").card is None
+        txn = budget.update_transaction(txn_id, type="card", card="Visa")
+        assert txn.card == "Visa"
 
     def test_update_nonexistent_transaction(self, budget):
         """Test updating a transaction that doesn't exist."""
@@ -86,9 +134,13 @@ class TestTransactions:
 
     def test_get_recent_transactions(self, budget):
         """Test getting recent transactions."""
-        budget.add_transaction("cash", "Coffee", 5.50)
-        budget.add_transaction("cash", "Lunch", 12.50)
-        budget.add_transaction("cash", "Dinner", 20.00)
+        budget.add_transactions(
+            [
+                {"type": "cash", "description": "Coffee", "amount": 5.50},
+                {"type": "cash", "description": "Lunch", "amount": 12.50},
+                {"type": "cash", "description": "Dinner", "amount": 20.00},
+            ]
+        )
 
         recent = budget.get_recent_transactions(2)
         assert len(recent) == 2
@@ -97,14 +149,38 @@ class TestTransactions:
 
     def test_search_transactions(self, budget):
         """Test searching transactions."""
-        budget.add_transaction("cash", "Coffee shop", 5.50, category="Food")
-        budget.add_transaction("card", "Coffee beans", 15.00, card="Visa", category="Groceries")
-        budget.add_transaction("cash", "Lunch", 12.50, category="Food")
+        budget.add_transactions(
+            [
+                {
+                    "type": "cash",
+                    "description": "Coffee shop",
+                    "amount": 5.50,
+                    "category": "Food",
+                },
+                {
+                    "type": "card",
+                    "description": "Coffee beans",
+                    "amount": 15.00,
+                    "card": "Visa",
+                    "category": "Groceries",
+                },
+                {
+                    "type": "cash",
+                    "description": "Lunch",
+                    "amount": 12.50,
+                    "category": "Food",
+                },
+            ]
+        )
 
         # Search by query
         results = budget.search_transactions(query="Coffee")
         assert len(results) == 2
 
+        # A null query (as MCP clients may send) means no text filter
+        results = budget.search_transactions(query=None, category="Food")
+        assert len(results) == 2
+
         # Search by category
         results = budget.search_transactions(category="Food")
         assert len(results) == 2
@@ -113,6 +189,96 @@ class TestTransactions:
         results = budget.search_transactions(min_amount=10.0)
         assert len(results) == 2
 
+        # Limit is applied in SQL, keeping newest first
+        results = budget.search_transactions(category="Food", limit=1)
+        assert [t.description for t in results] == ["Lunch"]
+
+        # Unsatisfiable filters return nothing
+        assert budget.search_transactions(min_amount=20.0, max_amount=10.0) == []
+        assert budget.search_transactions(category="Food", limit=0) == []
+
+        with pytest.raises(ValueError, match="at most 128 characters"):
+            budget.search_transactions(query="x" * 129)
+
+    def test_search_by_date_range(self, budget):
+        """Test that date filters include the whole end day."""
+        for day in (4, 5, 6):
+            budget.add_transaction_safe(
+                "cash", f"Day {day}", 1.0, date=datetime(2024, 1, day, 18, 30)
+            )
+
+        results = budget.search_transactions(
+            start_date="2024-01-05", end_date="2024-01-05"
+        )
+        assert [t.description for t in results] == ["Day 5"]
+        assert len(budget.search_transactions(end_date="2024-01-05T12:00")) == 1
+
+        with pytest.raises(ValueError, match="Invalid date"):
+            budget.search_transactions(start_date="05/01/2024")
+
+    def test_search_results_are_capped(self, budget, monkeypatch):
+        """Test that searches never return more than MAX_SEARCH_RESULTS rows."""
+        monkeypatch.setattr(budget_module, "MAX_SEARCH_RESULTS", 2)
+        budget.add_transactions(
+            [
+                {"type": "cash", "description": description, "amount": 5.0}
+                for description in ["Coffee", "Lunch", "Dinner"]
+            ]
+        )
+
+        assert [t.description for t in budget.search_transactions()] == [
+            "Dinner",
+            "Lunch",
+        ]
+        assert len(budget.search_transactions(limit=3)) == 2
+
+    def test_search_full_text_tracks_changes(self, budget):
+        """Test that text search follows updates and deletes."""
+        txn_id = budget.add_transaction("card", "Coffee beans", 15.0, card="Visa")
+        budget.add_transaction("cash", "Tea", 3.0)
+
+        assert [t.id for t in budget.search_transactions(query="ffee BE")] == [txn_id]
+        assert len(budget.search_transactions(query="vis")) == 1
+        assert len(budget.search_transactions(query='"')) == 0
+
+        budget.update_transaction(txn_id, description="Espresso")
+        assert budget.search_transactions(query="Coffee") == []
+        assert len(budget.search_transactions(query="spresso")) == 1
+
+        budget.delete_transaction(txn_id)
+        assert budget.search_transactions(query="spresso") == []
+
+    @pytest.mark.slow
+    def test_search_without_fts5(self, tmp_path, monkeypatch):
+        """Test that text search falls back to LIKE when FTS5 is missing."""
+        monkeypatch.setattr(budget_module, "_fts5_available", lambda conn: False)
+        budget = Budget(str(tmp_path / "nofts.db"))
+        try:
+            assert not budget.fts_enabled
+            budget.add_transaction("cash", "Coffee shop", 5.0)
+            assert len(budget.search_transactions(query="offee")) == 1
+        finally:
+            budget.close()
+
+    def test_iter_transactions(self, budget):
+        """Test streaming transactions in batches."""
+        seed = [(f"Item {i}", 1.0 + i, "Misc") for i in range(5)]
+        seed.append(("Other", 1.0, None))
+        budget.add_transactions(
+            [
+                {"type": "cash", "description": d, "amount": a, "category": c}
+                for d, a, c in seed
+            ]
+        )
+
+        streamed = budget.iter_transactions(batch_size=2, category="Misc")
+        assert [t.description for t in streamed] == [
+            f"Item {i}" for i in range(4, -1, -1)
+        ]
+
+        rows = list(budget.iter_transaction_rows(batch_size=2, query="Other"))
+        assert [(r.description, r.amount) for r in rows] == [("Other", 1.0)]
+
 
 class TestCategories:
     """Test category operations."""
@@ -170,6 +336,9 @@ class TestBalances:
         budget.update_balance("cash", 100.0)
         assert budget.get_balance("cash") == 100.0
 
+        budget.update_balance("cash", 40.0)
+        assert budget.get_balance("cash") == 40.0
+
     def test_get_all_balances(self, budget):
         """Test getting all balances."""
         budget.update_balance("cash", 100.0)
@@ -196,10 +365,15 @@ class TestSpendingLimits:
     def test_check_spending_limit(self, budget):
         """Test checking spending against limits."""
         budget.set_spending_limit(100.0, "monthly", category="Food")
-        budget.add_transaction("cash", "Lunch", 30.0, category="Food")
-        budget.add_transaction("cash", "Dinner", 40.0, category="Food")
+        budget.add_transactions(
+            [
+                {"type": "cash", "description": d, "amount": a, "category": "Food"}
+                for d, a in [("Lunch", 30.0), ("Dinner", 40.0)]
+            ]
+        )
 
         result = budget.check_spending_limit(category="Food", period="monthly")
+        assert result["has_limit"]
         assert result["limit"] == 100.0
         assert result["spent"] == 70.0
         assert result["remaining"] == 30.0
@@ -208,31 +382,218 @@ class TestSpendingLimits:
     def test_check_exceeded_limit(self, budget):
         """Test checking an exceeded limit."""
         budget.set_spending_limit(50.0, "monthly", category="Food")
-        budget.add_transaction("cash", "Lunch", 30.0, category="Food")
-        budget.add_transaction("cash", "Dinner", 40.0, category="Food")
+        budget.add_transactions(
+            [
+                {"type": "cash", "description": d, "amount": a, "category": "Food"}
+                for d, a in [("Lunch", 30.0), ("Dinner", 40.0)]
+            ]
+        )
 
         result = budget.check_spending_limit(category="Food", period="monthly")
         assert result["exceeded"]
 
+    def test_check_missing_limit(self, budget):
+        """Test checking criteria with no limit set."""
+        budget.set_spending_limit(0.0, "monthly", category="Treats")
+
+        assert not budget.check_spending_limit(category="Food")["has_limit"]
+        assert budget.check_spending_limit(category="Treats")["has_limit"]
+
 
 class TestReports:
     """Test reporting operations."""
 
+    pytestmark = pytest.mark.reports
+
     def test_get_daily_spending(self, budget):
         """Test getting daily spending."""
-        budget.add_transaction("cash", "Coffee", 5.50)
-        budget.add_transaction("cash", "Lunch", 12.50)
+        budget.add_transactions(
+            [
+                {"type": "cash", "description": "Coffee", "amount": 5.50},
+                {"type": "cash", "description": "Lunch", "amount": 12.50},
+            ]
+        )
 
         daily = budget.get_daily_spending(7)
         assert len(daily) > 0
 
+    def test_daily_spending_tracks_updates_and_deletes(self, budget):
+        """Test that daily totals follow transaction updates and deletes."""
+        today = datetime.now().strftime("%Y-%m-%d")
+        coffee_id = budget.add_transaction_safe("cash", "Coffee", 5.0)[0]
+        lunch_id = budget.add_transaction_safe("cash", "Lunch", 10.0)[0]
+
+        assert budget.get_daily_spending(7) == [(today, 15.0)]
+
+        budget.update_transaction(coffee_id, amount=7.0)
+        assert budget.get_daily_spending(7) == [(today, 17.0)]
+
+        budget.delete_transaction(lunch_id)
+        budget.delete_transaction(coffee_id)
+        assert budget.get_daily_spending(7) == []
+
+    def test_daily_spending_window_starts_at_exact_time(self, budget, monkeypatch):
+        """Test that the first day only counts transactions inside the window."""
+        for hour, amount in ((11, 1.0), (13, 2.0), (18, 4.0)):
+            date = datetime(2024, 1, 3, hour)
+            budget.add_transaction_safe("cash", f"Snack {hour}", amount, date=date)
+        budget.add_transaction_safe("cash", "Lunch", 8.0, date=datetime(2024, 1, 5, 9))
+
+        class FrozenDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return cls(2024, 1, 10, 12)
+
+        monkeypatch.setattr(budget_module, "datetime", FrozenDatetime)
+        # The window opens at 2024-01-03 12:00, so the 11:00 snack is left out
+        assert budget.get_daily_spending(7) == [
+            ("2024-01-03", 6.0),
+            ("2024-01-05", 8.0),
+        ]
+
     def test_get_spending_by_category(self, budget):
         """Test getting spending by category."""
         now = datetime.now()
-        budget.add_transaction("cash", "Coffee", 10.0, category="Food")
-        budget.add_transaction("cash", "Lunch", 20.0, category="Food")
-        budget.add_transaction("cash", "Bus", 5.0, category="Transport")
+        seed = [
+            ("Coffee", 10.0, "Food"),
+            ("Lunch", 20.0, "Food"),
+            ("Bus", 5.0, "Transport"),
+            ("Gift", 7.0, None),
+        ]
+        budget.add_transactions(
+            [
+                {"type": "cash", "description": d, "amount": a, "category": c}
+                for d, a, c in seed
+            ]
+        )
 
         spending = budget.get_spending_by_category(now.year, now.month)
         assert spending["Food"] == 30.0
         assert spending["Transport"] == 5.0
+        assert spending["Uncategorized"] == 7.0
+        assert list(spending) == ["Food", "Uncategorized", "Transport"]
+
+    def test_spending_by_category_cache_invalidation(self, budget):
+        """Test that cached past-month reports refresh after writes."""
+        date = datetime(2020, 3, 15)
+        budget.add_transaction_safe("cash", "Lunch", 10.0, date=date, category="Food")
+        assert budget.get_spending_by_category(2020, 3) == {"Food": 10.0}
+
+        # Served from cache on the second call
+        assert budget.get_spending_by_category(2020, 3) == {"Food": 10.0}
+
+        txn_id, _ = budget.add_transaction_safe(
+            "cash", "Bus", 4.0, date=date, category="Transport"
+        )
+        assert budget.get_spending_by_category(2020, 3) == {
+            "Food": 10.0,
+            "Transport": 4.0,
+        }
+
+        budget.update_transaction(txn_id, category="Food")
+        assert budget.get_spending_by_category(2020, 3) == {"Food": 14.0}
+
+    def test_spending_by_category_empty_month_skips_cache_fill(self, budget):
+        """Test that an empty past month is not written to on every call."""
+        writes = []
+
+        def record(conn, cursor, statement, *args):
+            if not statement.lstrip().upper().startswith("SELECT"):
+                writes.append(statement)
+
+        def record_commit(conn):
+            writes.append("COMMIT")
+
+        event.listen(budget.engine, "before_cursor_execute", record)
+        event.listen(budget.engine, "commit", record_commit)
+        try:
+            assert budget.get_spending_by_category(2020, 3) == {}
+            assert budget.get_spending_by_category(2020, 3) == {}
+        finally:
+            event.remove(budget.engine, "before_cursor_execute", record)
+            event.remove(budget.engine, "commit", record_commit)
+        assert writes == []
+
+    def test_spending_by_category_cache_fill_sees_concurrent_write(self, budget):
+        """Test that a write racing the cache fill is not lost from the cache."""
+        date = datetime(2020, 3, 15)
+        budget.add_transaction_safe("cash", "Lunch", 10.0, date=date, category="Food")
+        other = Budget(budget.db_name)
+        pending = [("cash", "Dinner", 4.0)]
+
+        def write_first(conn, cursor, statement, *args):
+            # Another tracker writes to the month just before the cache fill
+            if pending and statement.startswith("INSERT INTO monthly_report_cache"):
+                other.add_transaction_safe(*pending.pop(), date=date, category="Food")
+
+        event.listen(budget.engine, "before_cursor_execute", write_first)
+        try:
+            assert budget.get_spending_by_category(2020, 3) == {"Food": 14.0}
+            assert budget.get_spending_by_category(2020, 3) == {"Food": 14.0}
+        finally:
+            event.remove(budget.engine, "before_cursor_execute", write_first)
+            other.close()
+
+
+class TestDatabase:
+    """Test database connection setup."""
+
+    def test_connection_pragmas(self, budget):
+        """Test that pooled connections are tuned on connect."""
+        expected = {
+            "journal_mode": "wal",
+            "synchronous": 1,  # NORMAL
+            "temp_store": 2,  # MEMORY
+            "mmap_size": budget_module.SQLITE_MMAP_SIZE,
+            "cache_size": budget_module.SQLITE_CACHE_SIZE,
+        }
+        with budget.engine.connect() as conn:
+            for name, value in expected.items():
+                assert conn.exec_driver_sql(f"PRAGMA {name}").scalar() == value
+
+    @pytest.mark.parametrize(
+        ("value", "expected"), [("", 256 * 1024 * 1024), ("0", 0), ("4096", 4096)]
+    )
+    def test_mmap_size_from_environment(self, value, expected):
+        """Test that BUDGET_MMAP_SIZE overrides the default unless empty."""
+        env = {**os.environ, "BUDGET_MMAP_SIZE": value}
+        code = "import budget; print(budget.budget.SQLITE_MMAP_SIZE)"
+        # A fresh interpreter, since the size is read at import time
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=Path(budget_module.__file__).parents[1],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        assert int(out) == expected
+
+    @pytest.mark.slow
+    def test_reopen_skips_schema_setup(self, tmp_path):
+        """Test that a stamped database reopens without running any DDL."""
+        path = str(tmp_path / "reopen.db")
+        budget = Budget(path)
+        budget.add_transaction("cash", "Coffee", 5.0)
+        budget.close()
+
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        # The schema check runs inside Budget(), before its engine is reachable,
+        # so listen on every engine for the reopen
+        event.listen(Engine, "before_cursor_execute", record)
+        try:
+            budget = Budget(path)
+        finally:
+            event.remove(Engine, "before_cursor_execute", record)
+
+        try:
+            assert statements, "schema check issued no statements"
+            assert not [s for s in statements if "CREATE" in s.upper()]
+            budget.add_transaction("cash", "Coffee beans", 12.0)
+            assert len(budget.search_transactions(query="Coffee")) == 2
+        finally:
+            budget.close()
@@ -0,0 +1,73 @@
+"""Tests for the MCP transaction tool handlers."""
+
+import asyncio
+
+from sqlalchemy import event
+
+import budget.mcp.handlers as handlers
+from budget.mcp.handlers import TransactionHandlers
+
+
+def _text(result):
+    return result[0].text
+
+
+def _seed(budget, count):
+    budget.add_transactions(
+        [
+            {"type": "cash", "description": f"Coffee {i}", "amount": 1.0}
+            for i in range(count)
+        ]
+    )
+
+
+class TestResultCap:
+    def test_unfiltered_list_is_capped(self, budget, monkeypatch):
+        monkeypatch.setattr(handlers, "MAX_SEARCH_RESULTS", 2)
+        _seed(budget, 3)
+
+        result = asyncio.run(
+            TransactionHandlers(budget).handle_list_transactions({"limit": 100})
+        )
+
+        assert _text(result).count("Coffee") == 2
+
+    def test_search_reports_truncation(self, budget, monkeypatch):
+        monkeypatch.setattr(handlers, "MAX_SEARCH_RESULTS", 2)
+        _seed(budget, 3)
+
+        result = asyncio.run(TransactionHandlers(budget).handle_search_transactions({}))
+
+        text = _text(result)
+        assert text.startswith("Found more than 2 transactions, showing first 2:")
+        assert text.count("Coffee") == 2
+
+    def test_search_at_cap_is_not_truncated(self, budget, monkeypatch):
+        monkeypatch.setattr(handlers, "MAX_SEARCH_RESULTS", 2)
+        _seed(budget, 2)
+
+        result = asyncio.run(TransactionHandlers(budget).handle_search_transactions({}))
+
+        assert _text(result).startswith("Found 2 transactions:")
+
+
+class TestSearchShortCircuit:
+    def test_unsatisfiable_search_skips_database(self, budget):
+        _seed(budget, 1)
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(budget.engine, "before_cursor_execute", record)
+        try:
+            result = asyncio.run(
+                TransactionHandlers(budget).handle_search_transactions(
+                    {"min_amount": 20.0, "max_amount": 10.0}
+                )
+            )
+        finally:
+            event.remove(budget.engine, "before_cursor_execute", record)
+
+        assert _text(result) == "No matching transactions found"
+        assert statements == []
@@ -0,0 +1,218 @@
+"""Tests for the MCP tool router's read cache and admission control."""
+
+import asyncio
+
+import pytest
+from mcp.types import TextContent
+
+import budget.mcp.handlers as handlers
+from budget.mcp.handlers import ToolRouter
+
+
+def _text(result):
+    return result[0].text
+
+
+class _Counter:
+    """Stub handler that counts calls and echoes the call number."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self, arguments):
+        self.calls += 1
+        return [TextContent(type="text", text=f"call {self.calls}")]
+
+
+class TestReadCache:
+    def test_repeat_read_within_ttl_is_cached(self, budget):
+        router = ToolRouter(budget)
+        first = asyncio.run(router.route("list_categories", {}))
+
+        # Bypass the router so only a cache miss could see the new category
+        budget.add_category("Groceries")
+        second = asyncio.run(router.route("list_categories", {}))
+
+        assert second is first
+        assert "Groceries" not in _text(second)
+
+    def test_expired_entry_is_refreshed(self, budget, monkeypatch):
+        monkeypatch.setattr(handlers, "READ_CACHE_TTL", -1.0)
+        router = ToolRouter(budget)
+        read = router.routes["list_cards"] = _Counter()
+
+        asyncio.run(router.route("list_cards", {}))
+        asyncio.run(router.route("list_cards", {}))
+
+        assert read.calls == 2
+
+    def test_write_through_router_invalidates(self, budget):
+        router = ToolRouter(budget)
+        asyncio.run(router.route("list_categories", {}))
+
+        asyncio.run(router.route("add_category", {"name": "Groceries"}))
+        result = asyncio.run(router.route("list_categories", {}))
+
+        assert "Groceries" in _text(result)
+
+    @pytest.mark.parametrize("write_tool", sorted(handlers.WRITE_TOOLS))
+    def test_every_write_tool_invalidates(self, budget, write_tool):
+        router = ToolRouter(budget)
+        read = router.routes["list_cards"] = _Counter()
+        router.routes[write_tool] = _Counter()
+
+        asyncio.run(router.route("list_cards", {}))
+        asyncio.run(router.route(write_tool, {}))
+        asyncio.run(router.route("list_cards", {}))
+
+        assert read.calls == 2
+
+    def test_failed_write_still_invalidates(self, budget):
+        router = ToolRouter(budget)
+        read = router.routes["list_cards"] = _Counter()
+
+        async def failing(arguments):
+            raise ValueError("boom")
+
+        router.routes["add_card"] = failing
+        asyncio.run(router.route("list_cards", {}))
+        result = asyncio.run(router.route("add_card", {}))
+        asyncio.run(router.route("list_cards", {}))
+
+        assert _text(result) == "Error: boom"
+        assert read.calls == 2
+
+    def test_read_overlapping_write_is_not_stored(self, budget):
+        router = ToolRouter(budget)
+        release = asyncio.Event()
+        calls = []
+
+        async def slow_read(arguments):
+            calls.append(arguments)
+            await release.wait()
+            return [TextContent(type="text", text="stale")]
+
+        router.routes["list_cards"] = slow_read
+        router.routes["add_card"] = _Counter()
+
+        async def scenario():
+            read = asyncio.create_task(router.route("list_cards", {}))
+            await asyncio.sleep(0)
+            # The write finishes while the read is still running
+            await router.route("add_card", {})
+            release.set()
+            await read
+            await router.route("list_cards", {})
+
+        asyncio.run(scenario())
+
+        assert len(calls) == 2
+
+    def test_unhashable_arguments_skip_cache(self, budget):
+        router = ToolRouter(budget)
+        read = router.routes["list_transactions"] = _Counter()
+        arguments = {"categories": ["Food", "Travel"]}
+
+        asyncio.run(router.route("list_transactions", arguments))
+        asyncio.run(router.route("list_transactions", arguments))
+
+        assert read.calls == 2
+        assert router._read_cache == {}
+
+    def test_equal_values_of_different_types_are_cached_apart(self, budget):
+        router = ToolRouter(budget)
+        read = router.routes["list_transactions"] = _Counter()
+
+        async def scenario():
+            for limit in (1, True, 1.0, 1):
+                await router.route("list_transactions", {"limit": limit})
+
+        asyncio.run(scenario())
+
+        assert read.calls == 3
+
+    def test_errors_are_not_cached(self, budget):
+        router = ToolRouter(budget)
+
+        async def failing(arguments):
+            raise ValueError("boom")
+
+        router.routes["list_cards"] = failing
+        result = asyncio.run(router.route("list_cards", {}))
+
+        assert _text(result) == "Error: boom"
+        assert router._read_cache == {}
+
+    def test_least_recently_used_entry_is_evicted(self, budget):
+        router = ToolRouter(budget)
+        read = router.routes["get_balance"] = _Counter()
+
+        async def scenario():
+            for i in range(handlers.READ_CACHE_SIZE):
+                await router.route("get_balance", {"source": i})
+            # Touch the oldest entry so the second oldest becomes the LRU
+            await router.route("get_balance", {"source": 0})
+            await router.route("get_balance", {"source": "new"})
+
+        asyncio.run(scenario())
+
+        assert read.calls == handlers.READ_CACHE_SIZE + 1
+        assert len(router._read_cache) == handlers.READ_CACHE_SIZE
+        assert router._cache_key("get_balance", {"source": 0}) in router._read_cache
+        assert router._cache_key("get_balance", {"source": 1}) not in router._read_cache
+
+
+class TestAdmissionControl:
+    def _blocking_router(self, budget, max_in_flight):
+        router = ToolRouter(budget, max_in_flight=max_in_flight)
+        release = asyncio.Event()
+
+        async def blocked(arguments):
+            await release.wait()
+            return [TextContent(type="text", text="done")]
+
+        router.routes["add_card"] = blocked
+        return router, release
+
+    def test_rejects_calls_beyond_max_in_flight(self, budget):
+        router, release = self._blocking_router(budget, max_in_flight=2)
+
+        async def scenario():
+            running = [
+                asyncio.create_task(router.route("add_card", {})) for _ in range(2)
+            ]
+            await asyncio.sleep(0)
+            rejected = await router.route("add_card", {})
+            release.set()
+            return rejected, await asyncio.gather(*running)
+
+        rejected, finished = asyncio.run(scenario())
+
+        assert _text(rejected) == "Error: Server busy, please retry"
+        assert [_text(r) for r in finished] == ["done", "done"]
+        assert router._in_flight == 0
+
+    def test_admits_again_once_calls_finish(self, budget):
+        router, release = self._blocking_router(budget, max_in_flight=1)
+        release.set()
+
+        async def scenario():
+            await router.route("add_card", {})
+            return await router.route("add_card", {})
+
+        assert _text(asyncio.run(scenario())) == "done"
+
+    def test_none_means_unbounded(self, budget):
+        router, release = self._blocking_router(budget, max_in_flight=None)
+
+        async def scenario():
+            running = [
+                asyncio.create_task(router.route("add_card", {})) for _ in range(100)
+            ]
+            await asyncio.sleep(0)
+            release.set()
+            return await asyncio.gather(*running)
+
+        results = asyncio.run(scenario())
+
+        assert all(_text(r) == "done" for r in results)